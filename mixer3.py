@@ -4,20 +4,98 @@ from pygame.locals import *
 import time
 import sys
 import librosa
+import soundfile as sf
 import numpy as np
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import json
-from dataclasses import dataclass
+from numba import njit
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import pickle
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Optional
 import threading
+import queue
 import math
+import argparse
 
 # ==================== CONFIG ====================
 FADE_DURATION = 15000
 DEFAULT_BPM = 120
+MIN_BPM = 60
+MAX_BPM = 200
 DEFAULT_KEY = "Unknown"
-CACHE_FILE = "song_cache.json"
-MAX_WORKERS = 4
+# Per-user cache, so analysis is reused whatever directory the app is started from
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "hdj")
+CACHE_FILE = os.path.join(CACHE_DIR, "song_cache.pkl")
+CACHE_VERSION = 5
+CACHE_FLUSH_EVERY = 16  # analyzed songs between cache writes during a folder scan
+MAX_WORKERS = os.cpu_count() or 4
+ANALYSIS_DURATION = 60.0  # opening seconds used for BPM/key/energy
+# STFT frame at 22050 Hz; analyze_song scales both by the same power of two at
+# higher native rates so frequency resolution (which chroma needs) is unchanged
+N_FFT = 2048
+HOP_LENGTH = 512
+HANN_RMS = float(np.sqrt(np.mean(librosa.filters.get_window('hann', N_FFT) ** 2)))
+WAVEFORM_BINS = 800
+LOADING_REDRAW_MS = 100
+IDLE_FPS = 30    # steady playback: only the playhead and clock move
+ACTIVE_FPS = 60  # crossfades, pending beat-snapped fades and fader drags
+TRACK_END_EVENTS = (USEREVENT + 1, USEREVENT + 2)  # posted when channel 0 / 1 finishes
+SILENCE_THRESHOLD = 200  # int16 amplitude below which leading samples are skipped
+# Trades ~26 ms of extra output latency for resistance to underruns
+# (clicks/dropouts) while the UI thread is busy drawing
+MIXER_BUFFER = 4096
+
+# Crossfade gain curves (fade-in shape; fade-out is the mirror image)
+FADE_LUT_SIZE = 1024
+# Gain updates per fade; ticks that land on the same step skip set_volume
+FADE_GAIN_STEPS = 256
+FADE_RAMP_INTERVAL = 0.005  # seconds between envelope updates (~200 Hz)
+FADE_CURVES = {
+    'linear': lambda t: t,
+    'equal-power': lambda t: math.sin(t * math.pi / 2),
+    'exp-convex': lambda t: (math.exp(4 * t) - 1) / (math.exp(4) - 1),
+    'exp-concave': lambda t: 1 - (math.exp(4 * (1 - t)) - 1) / (math.exp(4) - 1),
+    's-curve': lambda t: 0.5 - 0.5 * math.cos(t * math.pi),
+}
+DEFAULT_FADE_CURVE = 'equal-power'
+
+SORT_MODES = ["bpm_key", "bpm", "energy"]
+SORT_LABELS = {"bpm_key": "BPM+KEY", "bpm": "BPM", "energy": "ENERGY"}
+SORT_COLORS = {"bpm_key": (80, 150, 80), "bpm": (80, 120, 180), "energy": (180, 120, 80)}
+
+KEY_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+
+# Krumhansl-Schmuckler key profiles, one column per key in KEY_IDX order
+# (12 majors then 12 minors), mean-centred so a dot product tracks correlation
+KS_MAJOR = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
+KS_MINOR = np.array([6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
+KEY_PROFILES = np.stack([np.roll(KS_MAJOR, i) for i in range(12)] +
+                        [np.roll(KS_MINOR, i) for i in range(12)], axis=1)
+KEY_PROFILES = (KEY_PROFILES - KEY_PROFILES.mean(axis=0)) / KEY_PROFILES.std(axis=0)
+
+# Playing screen layout
+DECK_A_RECT = pygame.Rect(20, 70, 660, 90)
+DECK_B_RECT = pygame.Rect(720, 70, 660, 90)
+WAVEFORM_RECT = pygame.Rect(20, 180, 1360, 160)
+XFADE_BAR_RECT = pygame.Rect(20, 450, 1360, 20)
+FADER_A_RECT = pygame.Rect(120, 500, 50, 250)
+FADER_B_RECT = pygame.Rect(1230, 500, 50, 250)
+PAUSE_BUTTON_RECT = pygame.Rect(300, 790, 150, 50)
+NEXT_BUTTON_RECT = pygame.Rect(480, 790, 150, 50)
+SORT_BUTTON_RECT = pygame.Rect(770, 790, 180, 50)
+TIME_DISPLAY_RECT = pygame.Rect(610, 360, 180, 60)
+
+# Regions that change from frame to frame during playback; the rest of the
+# playing screen only changes with the track, sort order or pause state
+LIVE_REGIONS = [
+    WAVEFORM_RECT.inflate(32, 4),       # playhead glow overhang and bottom grid line
+    TIME_DISPLAY_RECT.inflate(0, 20),
+    XFADE_BAR_RECT.inflate(2, 2),
+    FADER_A_RECT.inflate(40, 70),       # label above, value below, handle overhang
+    FADER_B_RECT.inflate(40, 70),
+    PAUSE_BUTTON_RECT.union(SORT_BUTTON_RECT),
+]
 
 # Camelot Wheel
 CAMELOT_WHEEL = {
@@ -29,46 +107,98 @@ CAMELOT_WHEEL = {
     'A#': '6B', 'A#m': '3A', 'B': '1B', 'Bm': '10A'
 }
 
+def build_fade_lut(curve: str):
+    """Precompute (fade_in, fade_out) gain tables indexed 0..FADE_LUT_SIZE"""
+    shape = FADE_CURVES[curve]
+    fade_in = [shape(i / FADE_LUT_SIZE) for i in range(FADE_LUT_SIZE + 1)]
+    fade_out = fade_in[::-1]
+    return fade_in, fade_out
+
+KEY_IDX = {name: i for i, name in enumerate(KEY_NAMES)}
+KEY_IDX.update({name + 'm': 12 + i for i, name in enumerate(KEY_NAMES)})
+UNKNOWN_KEY_IDX = 24
+
+def build_key_distance_table():
+    """Harmonic distance between all 24 keys, plus a last row/column for unknown keys"""
+    roots = np.arange(24) % 12
+    modes = np.arange(24) // 12
+    semitones = np.abs(roots[:, np.newaxis] - roots[np.newaxis, :])
+    table = np.full((25, 25), 999, dtype=np.int16)
+    table[:24, :24] = np.minimum(semitones, 12 - semitones) + 3 * (modes[:, np.newaxis] != modes[np.newaxis, :])
+    return table
+
+KEY_DIST = build_key_distance_table()
+
+def key_index(key: str) -> int:
+    """Row/column of a key name in KEY_DIST"""
+    idx = KEY_IDX.get(key)
+    if idx is not None:
+        return idx
+    if key == "Unknown":
+        return UNKNOWN_KEY_IDX
+    # Unrecognised roots are treated as C
+    return 12 if key.endswith('m') else 0
+
 def calculate_key_distance(key1: str, key2: str) -> int:
     """Calculate harmonic distance between keys"""
-    if key1 == "Unknown" or key2 == "Unknown":
-        return 999
-    if key1 == key2:
-        return 0
-    
-    key_map = {
-        'C': 0, 'C#': 1, 'D': 2, 'D#': 3, 'E': 4, 'F': 5,
-        'F#': 6, 'G': 7, 'G#': 8, 'A': 9, 'A#': 10, 'B': 11
-    }
-    
-    def parse_key(key):
-        if key.endswith('m'):
-            return key_map.get(key[:-1], 0), 'minor'
-        else:
-            return key_map.get(key, 0), 'major'
-    
-    root1, mode1 = parse_key(key1)
-    root2, mode2 = parse_key(key2)
-    
-    semitone_dist = min(abs(root1 - root2), 12 - abs(root1 - root2))
-    mode_penalty = 0 if mode1 == mode2 else 3
-    
-    return semitone_dist + mode_penalty
+    return int(KEY_DIST[key_index(key1), key_index(key2)])
+
+@njit(cache=True)
+def greedy_key_order(keys, key_dist):
+    """Nearest-key chain from the first song; ties go to the earliest remaining song"""
+    n = len(keys)
+    order = np.empty(n, dtype=np.int32)
+    used = np.zeros(n, dtype=np.bool_)
+    order[0] = 0
+    used[0] = True
+    current = 0
+    for step in range(1, n):
+        best = -1
+        best_dist = 0
+        for i in range(n):
+            if not used[i]:
+                d = key_dist[keys[current], keys[i]]
+                if best < 0 or d < best_dist:
+                    best = i
+                    best_dist = d
+        order[step] = best
+        used[best] = True
+        current = best
+    return order
 
-def get_compatible_keys(camelot):
+@lru_cache(maxsize=32)
+def get_compatible_keys(camelot) -> frozenset:
     """Get harmonically compatible keys"""
     if camelot == "?":
-        return []
+        return frozenset()
     try:
         num = int(camelot[:-1])
         letter = camelot[-1]
-        compatible = [camelot]
-        compatible.append(f"{num}{('A' if letter == 'B' else 'B')}")
-        compatible.append(f"{(num % 12) + 1}{letter}")
-        compatible.append(f"{((num - 2) % 12) + 1}{letter}")
-        return compatible
+        return frozenset((
+            camelot,
+            f"{num}{('A' if letter == 'B' else 'B')}",
+            f"{(num % 12) + 1}{letter}",
+            f"{((num - 2) % 12) + 1}{letter}",
+        ))
     except:
-        return [camelot]
+        return frozenset((camelot,))
+
+# Camelot compatibility as bitmasks: bit j of COMPAT_BITS[i] is set when code j
+# mixes harmonically after code i (index = (number - 1) * 2 + (letter == 'B'))
+CAMELOT_CODES = [f"{num}{letter}" for num in range(1, 13) for letter in "AB"]
+CAMELOT_IDX = {code: i for i, code in enumerate(CAMELOT_CODES)}
+COMPAT_BITS = np.zeros(len(CAMELOT_CODES), dtype=np.uint32)
+for code, idx in CAMELOT_IDX.items():
+    for compatible in get_compatible_keys(code):
+        COMPAT_BITS[idx] |= np.uint32(1 << CAMELOT_IDX[compatible])
+
+def is_camelot_compatible(camelot1: str, camelot2: str) -> bool:
+    """Single bit test; unknown codes are never compatible"""
+    idx1 = CAMELOT_IDX.get(camelot1)
+    idx2 = CAMELOT_IDX.get(camelot2)
+    if idx1 is None or idx2 is None:
+        return False
+    return bool((COMPAT_BITS[idx1] >> idx2) & 1)
 
 @dataclass
 class Song:
@@ -78,58 +208,84 @@ class Song:
     key: str
     camelot: str
     energy: float
-    waveform: list
+    waveform: np.ndarray
     duration: float
+    beat_ms: float = field(init=False, repr=False)
+    key_idx: int = field(init=False, repr=False)
+    leading_silence_ms: float = field(default=0, init=False, repr=False)
+    
+    def __post_init__(self):
+        self.beat_ms = 60000 / self.bpm if self.bpm > 0 else 0
+        self.key_idx = key_index(self.key)
     
     def is_compatible(self, other: 'Song') -> bool:
         bpm_diff = abs(self.bpm - other.bpm)
-        key_compatible = other.camelot in get_compatible_keys(self.camelot)
+        key_compatible = is_camelot_compatible(self.camelot, other.camelot)
         return bpm_diff <= 6 and key_compatible
 
 class SongCache:
+    """Analysis results keyed by file identity (size + mtime), pickled with a schema version"""
+    
+    @staticmethod
+    def key_for(path: str) -> str:
+        st = os.stat(path)
+        return f"{st.st_size}:{st.st_mtime_ns}"
+    
     @staticmethod
     def load():
         if os.path.exists(CACHE_FILE):
             try:
-                with open(CACHE_FILE, 'r') as f:
-                    return json.load(f)
+                with open(CACHE_FILE, 'rb') as f:
+                    data = pickle.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    return data['songs']
             except:
                 return {}
         return {}
     
     @staticmethod
     def save(cache):
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(cache, f)
+        # Write-then-rename so a crash mid-save never leaves a truncated cache
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_file = CACHE_FILE + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({'version': CACHE_VERSION, 'songs': cache}, f, protocol=5)
+        os.replace(tmp_file, CACHE_FILE)
 
 class MusicAnalyzer:
     @staticmethod
     def analyze_song(file_path: str) -> Optional[dict]:
         try:
-            y, sr = librosa.load(file_path, sr=22050, mono=True, duration=60.0)
+            # One decode: features use the opening window, the waveform the whole track
+            y_full, sr = MusicAnalyzer.load_audio(file_path)
+            y = y_full[:int(ANALYSIS_DURATION * sr)]
             
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-            tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=sr)
-            bpm = round(tempo[0]) if len(tempo) > 0 else DEFAULT_BPM
+            scale = 2 ** max(0, round(math.log2(sr / 22050)))
+            n_fft, hop_length = N_FFT * scale, HOP_LENGTH * scale
             
-            chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
+            # One STFT shared by the onset envelope, chroma and the RMS energy
+            S = np.abs(librosa.stft(y, n_fft=n_fft, hop_length=hop_length))
+            power = S**2
+            mel = librosa.feature.melspectrogram(S=power, sr=sr)
+            onset_env = librosa.onset.onset_strength(S=librosa.power_to_db(mel), sr=sr)
+            bpm = MusicAnalyzer.estimate_bpm(onset_env, sr, hop_length)
+            
+            # Assume concert tuning: estimating it costs more than the rest of the key
+            # detection, and commercial tracks rarely drift far enough to change the bin
+            chroma = librosa.feature.chroma_stft(S=power, sr=sr, n_fft=n_fft, hop_length=hop_length,
+                                                 tuning=0.0)
             chroma_avg = np.mean(chroma, axis=1)
-            key_index = np.argmax(chroma_avg)
-            key_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-            key = key_names[key_index]
             
-            harmonic = librosa.effects.harmonic(y)
-            tonnetz = librosa.feature.tonnetz(y=harmonic, sr=sr)
-            is_minor = tonnetz.mean(axis=1)[0] < 0
-            full_key = key + ("m" if is_minor else "")
+            # Best-correlated key profile gives both root and mode
+            best = int(np.argmax((chroma_avg - chroma_avg.mean()) @ KEY_PROFILES))
+            full_key = KEY_NAMES[best % 12] + ("m" if best >= 12 else "")
             camelot = CAMELOT_WHEEL.get(full_key, "?")
             
-            rms = librosa.feature.rms(y=y)
-            energy = float(np.mean(rms))
+            # Spectral RMS is attenuated by the Hann window; rescale to the time-domain level
+            rms = librosa.feature.rms(S=S, frame_length=n_fft, hop_length=hop_length)
+            energy = float(np.mean(rms) / HANN_RMS)
             
-            waveform_data = librosa.util.normalize(y)
-            waveform_data = waveform_data[::int(len(waveform_data) / 800)]
-            waveform = waveform_data.tolist()
+            waveform = MusicAnalyzer.waveform_bars(y_full)
             
             return {
                 'bpm': bpm,
@@ -137,51 +293,104 @@ class MusicAnalyzer:
                 'camelot': camelot,
                 'energy': energy,
                 'waveform': waveform,
-                'duration': None
+                'duration': len(y_full) / sr
             }
         except Exception as e:
             print(f"Error analyzing {file_path}: {e}")
             return None
     
     @staticmethod
-    def extract_waveform_fast(path: str) -> list:
+    def load_audio(file_path: str, duration: Optional[float] = None):
+        """Decode to mono float32 at the native rate, via libsndfile when it can read the file"""
         try:
-            y, sr = librosa.load(path, sr=11025, mono=True)
-            y = librosa.util.normalize(y)
-            y = y[::int(len(y) / 800)] if len(y) > 800 else y
-            return y.tolist()
-        except:
-            return []
+            with sf.SoundFile(file_path) as f:
+                frames = -1 if duration is None else int(duration * f.samplerate)
+                # One read as int16, downmixed straight into a float32 mono buffer:
+                # half the peak memory of an interleaved float32 decode. (libsndfile's
+                # MP3 decoder drops samples across partial reads, so no block streaming.)
+                pcm = f.read(frames, dtype='int16', always_2d=True)
+                y = pcm.sum(axis=1, dtype=np.float32)
+                y *= 1.0 / (32768 * pcm.shape[1])
+                return y, f.samplerate
+        except RuntimeError:
+            return librosa.load(file_path, sr=None, mono=True, duration=duration)
+    
+    @staticmethod
+    def estimate_bpm(onset_env, sr, hop_length=HOP_LENGTH) -> int:
+        """Global tempo from the FFT autocorrelation of the onset envelope"""
+        env = onset_env - np.mean(onset_env)
+        n = len(env)
+        fps = sr / hop_length
+        min_lag = max(1, math.ceil(fps * 60 / MAX_BPM))
+        max_lag = min(n - 2, int(fps * 60 / MIN_BPM))
+        if max_lag <= min_lag:
+            return DEFAULT_BPM
+        
+        # Zero-padded to 2n so the correlation is linear, not circular
+        spectrum = np.fft.rfft(env, n=2 * n)
+        ac = np.fft.irfft(np.abs(spectrum) ** 2)[:n]
+        
+        # Silent or beatless audio has no periodicity to pick a peak from
+        lags = np.arange(min_lag, max_lag + 1)
+        if ac[0] <= 0 or np.ptp(ac[lags]) <= 1e-6 * ac[0]:
+            return DEFAULT_BPM
+        
+        # Log-normal prior around DEFAULT_BPM resolves half/double tempo ambiguity
+        prior = np.exp(-0.5 * np.log2(60 * fps / lags / DEFAULT_BPM) ** 2)
+        lag = int(lags[np.argmax(ac[lags] * prior)])
+        
+        # Parabolic interpolation around the peak for sub-frame lag resolution
+        left, center, right = ac[lag - 1], ac[lag], ac[lag + 1]
+        denom = left - 2 * center + right
+        shift = 0.5 * (left - right) / denom if denom < 0 else 0.0
+        return min(MAX_BPM, max(MIN_BPM, round(60 * fps / (lag + shift))))
+    
+    @staticmethod
+    def waveform_bars(y, bins=WAVEFORM_BINS) -> np.ndarray:
+        """Peak level per bin, normalized to 0..1"""
+        if len(y) < bins:
+            return np.zeros(0, dtype=np.float32)
+        # Bin edges spread the remainder across bins instead of dropping the tail
+        edges = np.linspace(0, len(y), bins + 1, dtype=np.int64)[:-1]
+        bars = np.maximum.reduceat(np.abs(y), edges)
+        peak = bars.max()
+        if peak > 0:
+            bars = bars / peak
+        return bars.astype(np.float32)
 
 class SmartPlaylist:
     def __init__(self, songs: List[Song]):
         self.songs = songs
         self.current_index = 0
+        
+        # Sort fields as parallel arrays (same order as songs) so sorting runs in NumPy
+        self.bpms = np.array([s.bpm for s in songs], dtype=np.float64)
+        self.energies = np.array([s.energy for s in songs], dtype=np.float64)
+        self.key_idxs = np.array([s.key_idx for s in songs], dtype=np.intp)
+    
+    def reorder(self, order):
+        self.songs = [self.songs[i] for i in order]
+        self.bpms = self.bpms[order]
+        self.energies = self.energies[order]
+        self.key_idxs = self.key_idxs[order]
     
     def sort_by_energy(self):
-        self.songs.sort(key=lambda s: s.energy)
+        self.reorder(np.argsort(self.energies, kind='stable'))
     
     def sort_by_bpm_and_key(self):
-        self.songs.sort(key=lambda s: s.bpm)
-        from itertools import groupby
-        sorted_songs = []
-        for bpm, group in groupby(self.songs, key=lambda s: round(s.bpm)):
-            group_list = list(group)
-            if len(group_list) <= 1:
-                sorted_songs.extend(group_list)
-            else:
-                bpm_sorted = [group_list[0]]
-                remaining = group_list[1:]
-                while remaining:
-                    current = bpm_sorted[-1]
-                    best = min(remaining, key=lambda s: calculate_key_distance(current.key, s.key))
-                    bpm_sorted.append(best)
-                    remaining.remove(best)
-                sorted_songs.extend(bpm_sorted)
-        self.songs = sorted_songs
+        order = np.argsort(self.bpms, kind='stable')
+        
+        # Runs of equal rounded BPM are chained greedily by key distance
+        rounded = np.round(self.bpms[order])
+        bounds = [0, *(np.flatnonzero(np.diff(rounded)) + 1).tolist(), len(order)]
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if end - start > 1:
+                group = order[start:end]
+                order[start:end] = group[greedy_key_order(self.key_idxs[group], KEY_DIST)]
+        self.reorder(order)
     
     def sort_by_bpm(self):
-        self.songs.sort(key=lambda s: s.bpm)
+        self.reorder(np.argsort(self.bpms, kind='stable'))
     
     def get_next(self):
         self.current_index = (self.current_index + 1) % len(self.songs)
@@ -189,6 +398,9 @@ class SmartPlaylist:
     
     def get_current(self):
         return self.songs[self.current_index]
+    
+    def get_upcoming(self):
+        return self.songs[(self.current_index + 1) % len(self.songs)]
 
 # ==================== PROFESSIONAL DJ UI ====================
 class ProfessionalDJUI:
@@ -196,7 +408,7 @@ class ProfessionalDJUI:
     
     def __init__(self, width=1400, height=900):
         pygame.init()
-        pygame.mixer.init(frequency=44100, size=-16, channels=2)
+        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=MIXER_BUFFER)
         
         self.width = width
         self.height = height
@@ -233,6 +445,20 @@ class ProfessionalDJUI:
         self.line_color = (45, 45, 52)
         self.grid_color = (35, 35, 40)
         
+        # Constant labels are rasterized once instead of every frame
+        self.static_text = {
+            'logo': self.logo_font.render("HDJ", True, self.deck_a_color),
+            'logo_pro': self.small_font.render("PRO", True, self.text_secondary),
+            'title': self.logo_font.render("HDJ PRO", True, self.deck_a_color),
+            'loading_subtitle': self.header_font.render("Professional DJ Software", True, self.text_secondary),
+            'deck_a': self.logo_font.render("A", True, self.text_primary),
+            'deck_b': self.logo_font.render("B", True, self.text_primary),
+            'bpm': self.small_font.render("BPM", True, self.text_secondary),
+            'energy': self.tiny_font.render("ENERGY", True, self.text_dim),
+        }
+        # Track titles only change on track switch - memoized by name
+        self.text_cache = {}
+        
         try:
             self.background = pygame.image.load("vinyl.jpg").convert()
             self.background = pygame.transform.scale(self.background, (width, height))
@@ -240,13 +466,38 @@ class ProfessionalDJUI:
             self.background = None
         
         self.clock = pygame.time.Clock()
+        
+        self.drag_screen = None
+        self.drag_screen_shown = False
+        self.clicks = []
+        self.mouse_pos = (0, 0)
+        self.mouse_down = False
+        self.button_cache = {}
+        self.fader_handle_cache = {}
+        self.waveform_surfaces = None
+        self.gradient_cache = {}
+        self.glow_cache = {}
+        self.time_display = None
+    
+    def render_text(self, text, font, color):
+        """Render through a cache; the playing screen repeats the same strings every frame"""
+        key = (text, id(font), color)
+        surf = self.text_cache.get(key)
+        if surf is None:
+            surf = font.render(text, True, color).convert_alpha()
+            self.text_cache[key] = surf
+        return surf
     
     def draw_glow(self, x, y, radius, color, alpha=100):
         """Draw glowing effect"""
-        glow_surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-        for i in range(radius, 0, -2):
-            current_alpha = int(alpha * (radius - i) / radius)
-            pygame.draw.circle(glow_surf, (*color, current_alpha), (radius, radius), i)
+        glow_surf = self.glow_cache.get((radius, color, alpha))
+        if glow_surf is None:
+            glow_surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+            for i in range(radius, 0, -2):
+                current_alpha = int(alpha * (radius - i) / radius)
+                pygame.draw.circle(glow_surf, (*color, current_alpha), (radius, radius), i)
+            glow_surf = glow_surf.convert_alpha()
+            self.glow_cache[(radius, color, alpha)] = glow_surf
         self.screen.blit(glow_surf, (x - radius, y - radius))
     
     def draw_panel(self, x, y, w, h, title="", border_color=None):
@@ -270,42 +521,69 @@ class ProfessionalDJUI:
         border_col = border_color if border_color else self.line_color
         pygame.draw.rect(self.screen, border_col, (x, y, w, h), 2)
     
+    def gradient_surface(self, colors, size, vertical):
+        """Build a surface whose rows (vertical) or columns carry the given colors"""
+        colors = np.asarray(colors, dtype=np.uint8)
+        w, h = size
+        surf = pygame.Surface(size)
+        if vertical:
+            pixels = np.broadcast_to(colors[np.newaxis, :, :], (w, h, 3))
+        else:
+            pixels = np.broadcast_to(colors[:, np.newaxis, :], (w, h, 3))
+        pygame.surfarray.blit_array(surf, np.ascontiguousarray(pixels))
+        return surf.convert()
+    
+    def prerender_waveform(self, waveform, width, height, deck_color):
+        """Render played and unplayed copies of a waveform once per track"""
+        surfaces = []
+        bar_width = max(1, width // len(waveform))
+        center_y = height // 2
+        
+        # Raster mask of the mirrored bars, shared by both colour variants, laid
+        # out row-major like the surface; the bottom grid line sits one pixel below the panel
+        bar_heights = (waveform * (height * 0.48)).astype(np.int32)
+        columns = np.zeros(width, dtype=np.int32)
+        bars = min(len(bar_heights), -(-width // bar_width))
+        columns[:bars * bar_width] = np.repeat(2 * bar_heights[:bars], bar_width)[:width]
+        # Distance of each pixel row's centre from the centre line, in half pixels
+        rows = np.abs(2 * np.arange(height + 1, dtype=np.int32) - 2 * center_y + 1)
+        mask = rows[:, np.newaxis] < columns[np.newaxis, :]
+        
+        # Pixels are written in the display format, so the per-frame blits are straight copies
+        for color in (deck_color, (60, 60, 70)):
+            surf = pygame.Surface((width, height + 1)).convert()
+            surf.fill((20, 20, 24))
+            for i in range(5):
+                grid_y = (height // 4) * i
+                pygame.draw.line(surf, self.grid_color, (0, grid_y), (width, grid_y), 1)
+            pixels = pygame.surfarray.pixels2d(surf).T
+            np.copyto(pixels, surf.map_rgb(color), casting='unsafe', where=mask)
+            del pixels
+            surfaces.append(surf)
+        
+        return surfaces
+    
     def draw_waveform_pro(self, waveform, x, y, width, height, play_position, deck_color):
         """Professional waveform like Serato/Traktor"""
-        if not waveform:
+        if len(waveform) == 0:
             return
         
-        # Dark background
-        pygame.draw.rect(self.screen, (20, 20, 24), (x, y, width, height))
-        
-        # Grid lines
-        for i in range(5):
-            grid_y = y + (height // 4) * i
-            pygame.draw.line(self.screen, self.grid_color, (x, grid_y), (x + width, grid_y), 1)
+        # Played/unplayed layers are rebuilt only when the waveform or deck changes
+        key = (width, height, deck_color)
+        cached = self.waveform_surfaces
+        if cached is None or cached[0] is not waveform or cached[1] != key:
+            cached = (waveform, key, *self.prerender_waveform(waveform, width, height, deck_color))
+            self.waveform_surfaces = cached
+        played, unplayed = cached[2], cached[3]
         
-        # Waveform bars
+        # A bar counts as played once its start is behind the playhead
         bar_width = max(1, width // len(waveform))
-        center_y = y + height // 2
+        split = min(width, bar_width * math.ceil(play_position * len(waveform)))
+        self.screen.blit(unplayed, (x, y))
+        if split > 0:
+            self.screen.blit(played, (x, y), (0, 0, split, height + 1))
         
-        for i, sample in enumerate(waveform):
-            bar_x = x + i * bar_width
-            bar_h = int(abs(sample) * height * 0.48)
-            
-            # Determine color based on playback position
-            progress = i / len(waveform)
-            
-            if progress < play_position:
-                # Played - bright deck color
-                color = deck_color
-                alpha = 255
-            else:
-                # Unplayed - dim gray
-                color = (60, 60, 70)
-                alpha = 180
-            
-            # Draw mirrored waveform (top and bottom)
-            pygame.draw.rect(self.screen, color, (bar_x, center_y - bar_h, bar_width, bar_h))
-            pygame.draw.rect(self.screen, color, (bar_x, center_y, bar_width, bar_h))
+        center_y = y + height // 2
         
         # Center line
         pygame.draw.line(self.screen, (80, 80, 90), (x, center_y), (x + width, center_y), 2)
@@ -332,29 +610,33 @@ class ProfessionalDJUI:
         self.draw_panel(x, y, w, h, "", deck_color if is_active else None)
         
         # Deck indicator
-        deck_label = "A" if deck_color == self.deck_a_color else "B"
+        deck_label = 'deck_a' if deck_color == self.deck_a_color else 'deck_b'
         label_size = 40
         pygame.draw.circle(self.screen, deck_color if is_active else self.bg_highlight, 
                           (x + 30, y + 30), label_size // 2)
-        deck_text = self.logo_font.render(deck_label, True, self.text_primary)
+        deck_text = self.static_text[deck_label]
         deck_rect = deck_text.get_rect(center=(x + 30, y + 30))
-        self.screen.blit(deck_text, deck_rect)
         
         # Track title
-        track_text = self.title_font.render(song_info['Track'][:35], True, self.text_primary)
-        self.screen.blit(track_text, (x + 70, y + 15))
+        track_name = song_info['Track'][:35]
+        track_text = self.render_text(track_name, self.title_font, self.text_primary)
         
         # BPM - Large and prominent
-        bpm_text = self.logo_font.render(f"{song_info['BPM']}", True, deck_color)
-        self.screen.blit(bpm_text, (x + 70, y + 45))
-        
-        bpm_label = self.small_font.render("BPM", True, self.text_secondary)
-        self.screen.blit(bpm_label, (x + 145, y + 60))
+        bpm_text = self.render_text(f"{song_info['BPM']}", self.logo_font, deck_color)
+        bpm_label = self.static_text['bpm']
         
         # Key with Camelot
         key_str = f"{song_info['Key']}"
-        key_text = self.header_font.render(key_str, True, self.text_primary)
-        self.screen.blit(key_text, (x + 220, y + 50))
+        key_text = self.render_text(key_str, self.header_font, self.text_primary)
+        
+        # All deck text in one batched blit
+        self.screen.blits((
+            (deck_text, deck_rect),
+            (track_text, (x + 70, y + 15)),
+            (bpm_text, (x + 70, y + 45)),
+            (bpm_label, (x + 145, y + 60)),
+            (key_text, (x + 220, y + 50)),
+        ), doreturn=False)
         
         # Energy bar
         energy_val = float(song_info['Energy'])
@@ -367,15 +649,18 @@ class ProfessionalDJUI:
         fill_w = min(fill_w, energy_w)
         
         # Gradient energy bar
-        for i in range(fill_w):
-            blend = i / energy_w
-            color = tuple(int(self.accent_green[j] * (1-blend) + self.accent_red[j] * blend) 
-                         for j in range(3))
-            pygame.draw.line(self.screen, color, (energy_x + i, y + 50), (energy_x + i, y + 50 + energy_h))
+        gradient = self.gradient_cache.get('energy')
+        if gradient is None:
+            blend = (np.arange(energy_w) / energy_w)[:, np.newaxis]
+            colors = (np.array(self.accent_green) * (1 - blend) + np.array(self.accent_red) * blend).astype(np.int32)
+            gradient = self.gradient_surface(colors, (energy_w, energy_h + 1), vertical=False)
+            self.gradient_cache['energy'] = gradient
+        if fill_w > 0:
+            self.screen.blit(gradient, (energy_x, y + 50), (0, 0, fill_w, energy_h + 1))
         
         pygame.draw.rect(self.screen, self.line_color, (energy_x, y + 50, energy_w, energy_h), 1)
         
-        energy_label = self.tiny_font.render("ENERGY", True, self.text_dim)
+        energy_label = self.static_text['energy']
         self.screen.blit(energy_label, (energy_x, y + 62))
     
     def draw_fader_professional(self, x, y, width, height, value, label, color):
@@ -392,10 +677,14 @@ class ProfessionalDJUI:
         fill_y = y + height - fill_h
         
         # Gradient fill
-        for i in range(fill_h):
-            blend = i / height
-            grad_color = tuple(int(c * (0.3 + 0.7 * blend)) for c in color)
-            pygame.draw.line(self.screen, grad_color, (track_x, fill_y + i), (track_x + track_w, fill_y + i))
+        gradient = self.gradient_cache.get((color, height))
+        if gradient is None:
+            blend = (np.arange(height) / height)[:, np.newaxis]
+            colors = (np.array(color) * (0.3 + 0.7 * blend)).astype(np.int32)
+            gradient = self.gradient_surface(colors, (track_w + 1, height), vertical=True)
+            self.gradient_cache[(color, height)] = gradient
+        if fill_h > 0:
+            self.screen.blit(gradient, (track_x, fill_y), (0, 0, track_w + 1, fill_h))
         
         pygame.draw.rect(self.screen, self.line_color, (track_x, y, track_w, height), 1)
         
@@ -405,26 +694,31 @@ class ProfessionalDJUI:
         handle_h = 12
         handle_x = x + (width - handle_w) // 2
         
-        pygame.draw.rect(self.screen, color, (handle_x, handle_y - handle_h//2, handle_w, handle_h), border_radius=2)
-        pygame.draw.rect(self.screen, self.text_primary, (handle_x, handle_y - handle_h//2, handle_w, handle_h), 1, border_radius=2)
+        handle = self.fader_handle_cache.get(color)
+        if handle is None:
+            handle = pygame.Surface((handle_w, handle_h), pygame.SRCALPHA)
+            pygame.draw.rect(handle, color, (0, 0, handle_w, handle_h), border_radius=2)
+            pygame.draw.rect(handle, self.text_primary, (0, 0, handle_w, handle_h), 1, border_radius=2)
+            handle = handle.convert_alpha()
+            self.fader_handle_cache[color] = handle
+        self.screen.blit(handle, (handle_x, handle_y - handle_h//2))
         
         # Label
-        label_text = self.small_font.render(label, True, self.text_secondary)
+        label_text = self.render_text(label, self.small_font, self.text_secondary)
         label_rect = label_text.get_rect(center=(x + width // 2, y - 15))
         self.screen.blit(label_text, label_rect)
         
         # Value display
-        value_text = self.font.render(f"{int(value * 100)}", True, self.text_primary)
+        value_text = self.render_text(f"{int(value * 100)}", self.font, self.text_primary)
         value_rect = value_text.get_rect(center=(x + width // 2, y + height + 15))
         self.screen.blit(value_text, value_rect)
         
         return self.handle_fader_input(track_x, y, track_w, height)
     
     def handle_fader_input(self, x, y, w, h):
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pressed = pygame.mouse.get_pressed()[0]
+        mouse_pos = self.mouse_pos
         
-        if mouse_pressed and (x - 20 <= mouse_pos[0] <= x + w + 20 and 
+        if self.mouse_down and (x - 20 <= mouse_pos[0] <= x + w + 20 and 
                              y - 20 <= mouse_pos[1] <= y + h + 20):
             relative_y = mouse_pos[1] - y
             value = 1.0 - (relative_y / h)
@@ -433,56 +727,66 @@ class ProfessionalDJUI:
     
     def draw_button_pro(self, text, x, y, w, h, color, icon=None):
         """Professional button"""
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_clicked = pygame.mouse.get_pressed()[0]
+        mouse_pos = self.mouse_pos
         
         is_hover = (x <= mouse_pos[0] <= x + w and y <= mouse_pos[1] <= y + h)
         
-        # Button background
-        if is_hover:
-            btn_color = tuple(min(255, c + 30) for c in color)
-            pygame.draw.rect(self.screen, btn_color, (x, y, w, h), border_radius=4)
-        else:
-            pygame.draw.rect(self.screen, color, (x, y, w, h), border_radius=4)
-        
-        # Border
-        pygame.draw.rect(self.screen, self.text_primary if is_hover else self.line_color, 
-                        (x, y, w, h), 2, border_radius=4)
+        # Button body + border, pre-rendered per size/color/hover state
+        body_key = (w, h, color, is_hover)
+        body = self.button_cache.get(body_key)
+        if body is None:
+            body = pygame.Surface((w, h), pygame.SRCALPHA)
+            btn_color = tuple(min(255, c + 30) for c in color) if is_hover else color
+            pygame.draw.rect(body, btn_color, (0, 0, w, h), border_radius=4)
+            pygame.draw.rect(body, self.text_primary if is_hover else self.line_color, 
+                            (0, 0, w, h), 2, border_radius=4)
+            body = body.convert_alpha()
+            self.button_cache[body_key] = body
+        self.screen.blit(body, (x, y))
         
         # Text
-        text_surf = self.font.render(text, True, self.text_primary)
+        text_surf = self.render_text(text, self.font, self.text_primary)
         text_rect = text_surf.get_rect(center=(x + w // 2, y + h // 2))
         self.screen.blit(text_surf, text_rect)
         
-        return is_hover and mouse_clicked
+        # Clicks come from this frame's MOUSEBUTTONDOWN events, so a held
+        # button fires once
+        return any(x <= cx <= x + w and y <= cy <= y + h for cx, cy in self.clicks)
     
     def draw_time_display(self, elapsed_sec, total_sec, x, y):
         """Large professional time display"""
-        time_str = f"{elapsed_sec // 60:02d}:{elapsed_sec % 60:02d}"
-        total_str = f"{total_sec // 60:02d}:{total_sec % 60:02d}"
-        
-        # Time box
-        box_w, box_h = 180, 60
-        pygame.draw.rect(self.screen, self.bg_panel, (x, y, box_w, box_h))
-        pygame.draw.rect(self.screen, self.line_color, (x, y, box_w, box_h), 2)
-        
-        # Elapsed time (large)
-        time_text = self.logo_font.render(time_str, True, self.text_primary)
-        self.screen.blit(time_text, (x + 15, y + 5))
+        # The clock only changes once a second; keep the composed box until then
+        if self.time_display is None or self.time_display[0] != (elapsed_sec, total_sec):
+            time_str = f"{elapsed_sec // 60:02d}:{elapsed_sec % 60:02d}"
+            total_str = f"{total_sec // 60:02d}:{total_sec % 60:02d}"
+            
+            # Time box
+            box_w, box_h = 180, 60
+            box = pygame.Surface((box_w, box_h)).convert()
+            box.fill(self.bg_panel)
+            pygame.draw.rect(box, self.line_color, (0, 0, box_w, box_h), 2)
+            
+            # Elapsed time (large)
+            time_text = self.logo_font.render(time_str, True, self.text_primary)
+            box.blit(time_text, (15, 5))
+            
+            # Total time (small)
+            total_text = self.render_text(f"/ {total_str}", self.small_font, self.text_secondary)
+            box.blit(total_text, (15, 42))
+            self.time_display = ((elapsed_sec, total_sec), box)
         
-        # Total time (small)
-        total_text = self.small_font.render(f"/ {total_str}", True, self.text_secondary)
-        self.screen.blit(total_text, (x + 15, y + 42))
+        self.screen.blit(self.time_display[1], (x, y))
     
     def draw_loading_screen(self, progress, total, current_file=""):
+        self.drag_screen_shown = False
         self.screen.fill(self.bg_main)
         
         # Title
-        title = self.logo_font.render("HDJ PRO", True, self.deck_a_color)
+        title = self.static_text['title']
         title_rect = title.get_rect(center=(self.width // 2, 200))
         self.screen.blit(title, title_rect)
         
-        subtitle = self.header_font.render("Professional DJ Software", True, self.text_secondary)
+        subtitle = self.static_text['loading_subtitle']
         subtitle_rect = subtitle.get_rect(center=(self.width // 2, 250))
         self.screen.blit(subtitle, subtitle_rect)
         
@@ -514,52 +818,65 @@ class ProfessionalDJUI:
         pygame.display.flip()
     
     def draw_drag_screen(self):
-        self.screen.fill(self.bg_main)
+        """Present the static drop screen - composed once, flipped only when stale"""
+        if self.drag_screen_shown:
+            return
+        
+        if self.drag_screen is None:
+            self.drag_screen = self.compose_drag_screen()
+        
+        self.screen.blit(self.drag_screen, (0, 0))
+        pygame.display.flip()
+        self.drag_screen_shown = True
+    
+    def compose_drag_screen(self):
+        surf = pygame.Surface((self.width, self.height)).convert()
+        surf.fill(self.bg_main)
         
         # Logo
-        logo = self.logo_font.render("HDJ PRO", True, self.deck_a_color)
+        logo = self.static_text['title']
         logo_rect = logo.get_rect(center=(self.width // 2, 200))
-        self.screen.blit(logo, logo_rect)
+        surf.blit(logo, logo_rect)
         
         subtitle = self.header_font.render("Professional DJ Mixing Software", True, self.text_secondary)
         subtitle_rect = subtitle.get_rect(center=(self.width // 2, 250))
-        self.screen.blit(subtitle, subtitle_rect)
+        surf.blit(subtitle, subtitle_rect)
         
         # Drop zone
         drop_w, drop_h = 600, 200
         drop_x = (self.width - drop_w) // 2
         drop_y = 320
         
-        pygame.draw.rect(self.screen, self.bg_panel, (drop_x, drop_y, drop_w, drop_h))
-        pygame.draw.rect(self.screen, self.deck_a_color, (drop_x, drop_y, drop_w, drop_h), 3)
+        pygame.draw.rect(surf, self.bg_panel, (drop_x, drop_y, drop_w, drop_h))
+        pygame.draw.rect(surf, self.deck_a_color, (drop_x, drop_y, drop_w, drop_h), 3)
         
         inst = self.title_font.render("DROP MUSIC FOLDER HERE", True, self.text_primary)
         inst_rect = inst.get_rect(center=(self.width // 2, drop_y + 80))
-        self.screen.blit(inst, inst_rect)
+        surf.blit(inst, inst_rect)
         
         inst2 = self.font.render("MP3 Format | Auto BPM & Key Detection", True, self.text_secondary)
         inst2_rect = inst2.get_rect(center=(self.width // 2, drop_y + 120))
-        self.screen.blit(inst2, inst2_rect)
+        surf.blit(inst2, inst2_rect)
         
         # Features
         features = ["Harmonic Mixing", "Smart Sorting", "Professional Waveforms", "Auto Crossfade"]
         y = 580
         for i, feat in enumerate(features):
             x_pos = 200 + i * 250
-            pygame.draw.rect(self.screen, self.bg_panel, (x_pos - 80, y - 10, 160, 40))
-            pygame.draw.rect(self.screen, self.line_color, (x_pos - 80, y - 10, 160, 40), 1)
+            pygame.draw.rect(surf, self.bg_panel, (x_pos - 80, y - 10, 160, 40))
+            pygame.draw.rect(surf, self.line_color, (x_pos - 80, y - 10, 160, 40), 1)
             
             feat_text = self.small_font.render(feat, True, self.text_primary)
             feat_rect = feat_text.get_rect(center=(x_pos, y + 10))
-            self.screen.blit(feat_text, feat_rect)
+            surf.blit(feat_text, feat_rect)
         
-        pygame.display.flip()
+        return surf
 
 # Continue in next part...
 
 # ==================== MAIN APPLICATION ====================
 class DJMixerApp:
-    def __init__(self):
+    def __init__(self, fade_curve=DEFAULT_FADE_CURVE):
         self.ui = ProfessionalDJUI()
         self.playlist = None
         
@@ -578,6 +895,16 @@ class DJMixerApp:
         print()
         
         self.channels = [pygame.mixer.Channel(i) for i in range(2)]
+        for channel, end_event in zip(self.channels, TRACK_END_EVENTS):
+            channel.set_endevent(end_event)
+        # (path, Sound) per channel, plus the upcoming track once preloaded;
+        # nothing else stays decoded
+        self.deck_sounds = [None, None]
+        self.preloaded = None
+        self.preloading = False
+        self.sounds_lock = threading.Lock()
+        # Paths SDL_mixer failed to decode; they stay listed but are skipped
+        self.unplayable = set()
         self.current_channel = 0
         self.volumes = [1.0, 1.0]
         self.channel_song_index = [0, 0]
@@ -586,119 +913,219 @@ class DJMixerApp:
         self.is_paused = False
         self.pause_position = 0
         self.fade_start = 0
+        self.fade_lock = threading.Lock()
+        self.pending_fade_at = 0
+        self.last_fade_step = -1
+        self.fade_in_lut, self.fade_out_lut = build_fade_lut(fade_curve)
         self.track_start_time = 0
+        self.last_loading_draw = 0
+        self.loading_updates = queue.Queue()
+        self.loading_progress = None
         
         self.sort_mode = "bpm_key"
+        self.hud_key = None
+        self.hud_snapshot = None
     
     def load_folder_parallel(self, folder_path):
         self.state = "loading"
         
-        mp3_files = [f for f in os.listdir(folder_path) 
-                     if f.lower().endswith('.mp3')]
+        mp3_files = sorted(f for f in os.listdir(folder_path) 
+                           if f.lower().endswith('.mp3'))
         
         if not mp3_files:
             self.state = "waiting"
             return
         
-        songs = []
+        songs_by_index = {}
         processed = 0
         total = len(mp3_files)
+        self.last_loading_draw = 0
         
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_file = {}
+        # Analysis is pure CPU work per file: fan out across processes so it
+        # isn't serialized on the GIL. Spawn, since this runs beside SDL threads.
+        with ProcessPoolExecutor(max_workers=MAX_WORKERS,
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            pending = []
             
-            for file in mp3_files:
+            for idx, file in enumerate(mp3_files):
                 full_path = os.path.join(folder_path, file)
+                try:
+                    cache_key = SongCache.key_for(full_path)
+                except OSError as e:
+                    # Dangling symlink or unreadable entry
+                    print(f"Skipping {file}: {e}")
+                    processed += 1
+                    self.report_loading_progress(processed, total, file)
+                    continue
                 
-                if full_path in self.cache:
+                if cache_key in self.cache:
                     try:
-                        cached = self.cache[full_path]
-                        sound = pygame.mixer.Sound(full_path)
-                        real_duration = sound.get_length()
-                        
+                        cached = self.cache[cache_key]
                         song = Song(
                             file=file, path=full_path, bpm=cached['bpm'],
                             key=cached['key'], camelot=cached['camelot'],
                             energy=cached['energy'], waveform=cached['waveform'],
-                            duration=real_duration
+                            duration=cached['duration']
                         )
-                        songs.append((song, sound))
-                        
-                        if cached.get('duration') != real_duration:
-                            cached['duration'] = real_duration
-                            self.cache[full_path] = cached
+                        songs_by_index[idx] = song
                         
                         processed += 1
-                        self.ui.draw_loading_screen(processed, total, file)
-                        pygame.event.pump()
+                        self.report_loading_progress(processed, total, file)
                         continue
                     except:
                         pass
                 
-                future = executor.submit(MusicAnalyzer.analyze_song, full_path)
-                future_to_file[future] = (file, full_path)
+                pending.append((idx, file, full_path, cache_key))
             
-            for future in as_completed(future_to_file):
-                file, full_path = future_to_file[future]
-                result = future.result()
-                
+            # Hand files out in batches to cut per-task IPC, while keeping
+            # enough batches that every worker stays busy
+            chunksize = max(1, len(pending) // (MAX_WORKERS * 4))
+            results = executor.map(MusicAnalyzer.analyze_song,
+                                   [item[2] for item in pending], chunksize=chunksize)
+            
+            for analyzed, ((idx, file, full_path, cache_key), result) in enumerate(zip(pending, results), 1):
                 if result:
                     try:
-                        sound = pygame.mixer.Sound(full_path)
-                        real_duration = sound.get_length()
-                        
                         song = Song(
                             file=file, path=full_path, bpm=result['bpm'],
                             key=result['key'], camelot=result['camelot'],
                             energy=result['energy'], waveform=result['waveform'],
-                            duration=real_duration
+                            duration=result['duration']
                         )
-                        songs.append((song, sound))
+                        songs_by_index[idx] = song
                         
-                        result['duration'] = real_duration
-                        self.cache[full_path] = result
+                        self.cache[cache_key] = result
                     except Exception as e:
                         print(f"Error loading {file}: {e}")
                 
                 processed += 1
-                self.ui.draw_loading_screen(processed, total, file)
-                pygame.event.pump()
+                self.report_loading_progress(processed, total, file)
+                
+                # Flush periodically so an interrupted scan keeps finished work
+                if analyzed % CACHE_FLUSH_EVERY == 0:
+                    SongCache.save(self.cache)
         
         SongCache.save(self.cache)
         
+        # Cached songs are collected before analyzed ones; keep folder order for a stable playlist
+        songs = [songs_by_index[idx] for idx in sorted(songs_by_index)]
         if songs:
-            song_objects = [s[0] for s in songs]
-            self.sounds = {s[0].file: s[1] for s in songs}
-            
-            self.playlist = SmartPlaylist(song_objects)
+            self.playlist = SmartPlaylist(songs)
             self.apply_sort()
             
-            current_song = self.playlist.get_current()
-            self.channels[self.current_channel].play(self.sounds[current_song.file])
+            playable = self.find_playable(self.playlist.current_index, len(songs))
+            if playable is None:
+                self.state = "waiting"
+                return
+            self.playlist.current_index, current_song, sound = playable
+            self.play_on_deck(self.current_channel, current_song, sound)
             self.channels[self.current_channel].set_volume(self.volumes[self.current_channel])
             self.track_start_time = pygame.time.get_ticks()
             self.pause_position = 0
             self.channel_song_index[self.current_channel] = self.playlist.current_index
             self.state = "playing"
-            
-            print("\nGenerating full waveforms in background...")
-            threading.Thread(target=self.generate_full_waveforms, daemon=True).start()
+            self.preload_next_track()
         else:
             self.state = "waiting"
     
-    def generate_full_waveforms(self):
-        for song in self.playlist.songs:
+    def load_sound(self, song):
+        """Decode a track on demand, reusing a loaded slot; None if SDL_mixer can't play it"""
+        with self.sounds_lock:
+            for slot in (*self.deck_sounds, self.preloaded):
+                if slot is not None and slot[0] == song.path:
+                    return slot[1]
+            if song.path in self.unplayable:
+                return None
+        try:
+            sound = pygame.mixer.Sound(song.path)
+        except (pygame.error, OSError) as e:
+            # Undecodable, or moved/deleted since the folder was loaded
+            print(f"Cannot play {song.file}: {e}")
+            with self.sounds_lock:
+                self.unplayable.add(song.path)
+            return None
+        return self.trim_leading_silence(song, sound)
+    
+    def find_playable(self, start_idx, count):
+        """(index, song, sound) of the first decodable track among count from start_idx"""
+        for offset in range(count):
+            idx = (start_idx + offset) % len(self.playlist.songs)
+            song = self.playlist.songs[idx]
+            sound = self.load_sound(song)
+            if sound is not None:
+                return idx, song, sound
+        return None
+    
+    def play_on_deck(self, channel, song, sound):
+        """Start a track on a channel; its Sound moves from the preload slot to the deck"""
+        with self.sounds_lock:
+            self.deck_sounds[channel] = (song.path, sound)
+            if self.preloaded is not None and self.preloaded[0] == song.path:
+                self.preloaded = None
+        self.channels[channel].play(sound)
+    
+    def trim_leading_silence(self, song, sound):
+        """Start playback at the first audible sample so fades don't mix silence"""
+        freq, size, channels = pygame.mixer.get_init()
+        raw = sound.get_raw()
+        pcm = np.frombuffer(raw, dtype=np.int16).reshape(-1, channels)
+        
+        # One vectorized pass: a frame is audible if any channel crosses the threshold
+        audible = ((pcm > SILENCE_THRESHOLD) | (pcm < -SILENCE_THRESHOLD)).any(axis=1)
+        onset = int(np.argmax(audible))
+        if onset == 0:
+            return sound
+        
+        song.leading_silence_ms = onset * 1000 / freq
+        return pygame.mixer.Sound(buffer=memoryview(raw)[onset * channels * pcm.itemsize:])
+    
+    def preload_next_track(self):
+        """Decode the upcoming track in the background so the crossfade starts instantly"""
+        with self.sounds_lock:
+            # A decode already in flight re-checks the upcoming track when it finishes
+            if self.preloading:
+                return
+            self.preloading = True
+        threading.Thread(target=self.preload_sound, daemon=True).start()
+    
+    def preload_sound(self):
+        try:
+            while True:
+                song = self.playlist.get_upcoming()
+                sound = self.load_sound(song)
+                with self.sounds_lock:
+                    # Keep the result only if a re-sort didn't change the upcoming track meanwhile
+                    if self.playlist.get_upcoming() is song:
+                        if sound is not None:
+                            self.preloaded = (song.path, sound)
+                        return
+        finally:
+            # Cleared even if the decode raised, so later preloads aren't blocked
+            with self.sounds_lock:
+                self.preloading = False
+    
+    def report_loading_progress(self, processed, total, file):
+        # Called from the loader thread; only the main thread touches the display
+        self.loading_updates.put((processed, total, file))
+    
+    def show_loading_progress(self):
+        """Draw the newest progress the loader posted"""
+        while True:
             try:
-                if song.duration > 70:
-                    full_waveform = MusicAnalyzer.extract_waveform_fast(song.path)
-                    if full_waveform:
-                        song.waveform = full_waveform
-                        if song.path in self.cache:
-                            self.cache[song.path]['waveform'] = full_waveform
-            except:
-                pass
-        SongCache.save(self.cache)
-        print("Full waveforms generated!")
+                self.loading_progress = self.loading_updates.get_nowait()
+            except queue.Empty:
+                break
+        if self.loading_progress is None:
+            return
+        
+        # Redraw at most every LOADING_REDRAW_MS; always show the final state
+        processed, total, file = self.loading_progress
+        now = pygame.time.get_ticks()
+        if processed < total and now - self.last_loading_draw < LOADING_REDRAW_MS:
+            return
+        self.last_loading_draw = now
+        self.loading_progress = None
+        self.ui.draw_loading_screen(processed, total, file)
     
     def apply_sort(self):
         if self.sort_mode == "bpm_key":
@@ -708,22 +1135,54 @@ class DJMixerApp:
         elif self.sort_mode == "energy":
             self.playlist.sort_by_energy()
     
+    def request_crossfade(self):
+        """Schedule a manual transition on the next beat of the playing track"""
+        if self.fade_start > 0 or self.pending_fade_at > 0:
+            return
+        
+        current_song = self.playlist.songs[self.channel_song_index[self.current_channel]]
+        if self.is_paused or current_song.beat_ms <= 0:
+            self.trigger_crossfade()
+            return
+        
+        # Beat grid is anchored at the start of playback
+        now = pygame.time.get_ticks()
+        offset = (now - self.track_start_time) % current_song.beat_ms
+        self.pending_fade_at = now + int(current_song.beat_ms - offset)
+    
     def trigger_crossfade(self):
+        self.pending_fade_at = 0
         if self.fade_start > 0:
             return
         
-        next_song_idx = (self.playlist.current_index + 1) % len(self.playlist.songs)
-        next_song = self.playlist.songs[next_song_idx]
+        # Skip tracks SDL_mixer can't decode; the search wraps round to the current
+        # track, so a one-track (or one-playable-track) folder plays it again
+        playable = self.find_playable(self.playlist.current_index + 1, len(self.playlist.songs))
+        if playable is None:
+            return
+        next_song_idx, next_song, next_sound = playable
         next_channel = (self.current_channel + 1) % 2
         
-        self.channels[next_channel].play(self.sounds[next_song.file])
-        self.channels[next_channel].set_volume(0.0)
-        self.channel_song_index[next_channel] = next_song_idx
+        with self.fade_lock:
+            self.play_on_deck(next_channel, next_song, next_sound)
+            self.channels[next_channel].set_volume(0.0)
+            self.channel_song_index[next_channel] = next_song_idx
+            
+            self.fade_start = pygame.time.get_ticks()
+            self.last_fade_step = -1
+            self.track_start_time = pygame.time.get_ticks()
+            self.pause_position = 0
+            self.is_paused = False
         
-        self.fade_start = pygame.time.get_ticks()
-        self.track_start_time = pygame.time.get_ticks()
-        self.pause_position = 0
-        self.is_paused = False
+        threading.Thread(target=self.run_crossfade_ramp, args=(self.fade_start,), 
+                         daemon=True).start()
+    
+    def run_crossfade_ramp(self, fade_start):
+        """Drive the fade envelope at a fixed rate, independent of the UI frame rate"""
+        while self.fade_start == fade_start:
+            with self.fade_lock:
+                self.update_crossfade()
+            time.sleep(FADE_RAMP_INTERVAL)
     
     def update_crossfade(self):
         if self.fade_start == 0:
@@ -732,42 +1191,49 @@ class DJMixerApp:
         elapsed = pygame.time.get_ticks() - self.fade_start
         
         if elapsed <= FADE_DURATION:
-            progress = elapsed / FADE_DURATION
+            step = elapsed * FADE_GAIN_STEPS // FADE_DURATION
+            if step == self.last_fade_step:
+                return
+            self.last_fade_step = step
+            
+            lut_idx = step * FADE_LUT_SIZE // FADE_GAIN_STEPS
             self.channels[self.current_channel].set_volume(
-                (1 - progress) * self.volumes[self.current_channel]
+                self.fade_out_lut[lut_idx] * self.volumes[self.current_channel]
             )
             self.channels[(self.current_channel + 1) % 2].set_volume(
-                progress * self.volumes[(self.current_channel + 1) % 2]
+                self.fade_in_lut[lut_idx] * self.volumes[(self.current_channel + 1) % 2]
             )
         else:
             self.channels[self.current_channel].stop()
+            with self.sounds_lock:
+                self.deck_sounds[self.current_channel] = None
             self.current_channel = (self.current_channel + 1) % 2
             self.playlist.current_index = self.channel_song_index[self.current_channel]
             self.fade_start = 0
+            self.preload_next_track()
+            # An incoming track shorter than the fade already ended, and its end
+            # event was ignored while it wasn't current; move on from the main loop
+            if not self.channels[self.current_channel].get_busy():
+                self.pending_fade_at = pygame.time.get_ticks()
     
-    def draw_playing_screen(self):
-        """Professional DJ interface"""
+    def draw_static_hud(self, current_song_idx, current_song, next_song):
+        """Panels that only change with the track, sort order or pause state"""
         self.ui.screen.fill(self.ui.bg_main)
         
-        current_song_idx = self.channel_song_index[self.current_channel]
-        current_song = self.playlist.songs[current_song_idx]
-        
-        next_song_idx = (current_song_idx + 1) % len(self.playlist.songs)
-        next_song = self.playlist.songs[next_song_idx]
-        
         # Top bar
-        logo = self.ui.logo_font.render("HDJ", True, self.ui.deck_a_color)
-        self.ui.screen.blit(logo, (20, 15))
-        
-        pro_text = self.ui.small_font.render("PRO", True, self.ui.text_secondary)
-        self.ui.screen.blit(pro_text, (80, 35))
+        logo = self.ui.static_text['logo']
+        pro_text = self.ui.static_text['logo_pro']
         
         # Track counter
-        counter_text = self.ui.font.render(
+        counter_text = self.ui.render_text(
             f"Track {current_song_idx + 1}/{len(self.playlist.songs)}", 
-            True, self.ui.text_secondary
+            self.ui.font, self.ui.text_secondary
         )
-        self.ui.screen.blit(counter_text, (self.ui.width - 180, 30))
+        self.ui.screen.blits((
+            (logo, (20, 15)),
+            (pro_text, (80, 35)),
+            (counter_text, (self.ui.width - 180, 30)),
+        ), doreturn=False)
         
         # Deck A (current)
         current_info = {
@@ -776,7 +1242,7 @@ class DJMixerApp:
             'Key': f"{current_song.key} ({current_song.camelot})",
             'Energy': f"{current_song.energy:.2f}"
         }
-        self.ui.draw_deck_display(20, 70, 660, 90, current_info, self.ui.deck_a_color, True)
+        self.ui.draw_deck_display(*DECK_A_RECT, current_info, self.ui.deck_a_color, True)
         
         # Deck B (next)
         next_info = {
@@ -785,76 +1251,116 @@ class DJMixerApp:
             'Key': f"{next_song.key} ({next_song.camelot})",
             'Energy': f"{next_song.energy:.2f}"
         }
-        self.ui.draw_deck_display(720, 70, 660, 90, next_info, self.ui.deck_b_color, False)
+        self.ui.draw_deck_display(*DECK_B_RECT, next_info, self.ui.deck_b_color, False)
         
         # Compatibility
         is_compat = current_song.is_compatible(next_song)
         compat_text = "COMPATIBLE" if is_compat else "CHECK MIX"
         compat_color = self.ui.accent_green if is_compat else self.ui.accent_orange
-        compat = self.ui.small_font.render(compat_text, True, compat_color)
+        compat = self.ui.render_text(compat_text, self.ui.small_font, compat_color)
         self.ui.screen.blit(compat, (730, 145))
         
+        # Status info
+        status_y = 855
+        status_items = [
+            (f"BPM: {current_song.bpm:.0f}", 30),
+            (f"KEY: {current_song.key} ({current_song.camelot})", 180),
+            (f"ENERGY: {current_song.energy:.2f}", 420),
+            (f"SORT: {SORT_LABELS[self.sort_mode]}", 620)
+        ]
+        
+        self.ui.screen.blits(
+            [(self.ui.render_text(text, self.ui.tiny_font, self.ui.text_dim), (x_pos, status_y))
+             for text, x_pos in status_items],
+            doreturn=False
+        )
+    
+    def draw_playing_screen(self):
+        """Professional DJ interface"""
+        # Consistent snapshot of the deck state the crossfade ramp thread updates
+        with self.fade_lock:
+            current_song_idx = self.channel_song_index[self.current_channel]
+            fade_start = self.fade_start
+        current_song = self.playlist.songs[current_song_idx]
+        
+        next_song_idx = (current_song_idx + 1) % len(self.playlist.songs)
+        next_song = self.playlist.songs[next_song_idx]
+        
+        # The static panels are drawn once per track/sort/pause change and
+        # kept as a backdrop; other frames only restore and redraw the live regions
+        hud_key = (id(current_song), id(next_song), self.sort_mode, self.is_paused)
+        rebuild = hud_key != self.hud_key
+        if rebuild:
+            self.hud_key = hud_key
+            self.ui.text_cache.clear()
+            self.draw_static_hud(current_song_idx, current_song, next_song)
+            self.hud_snapshot = self.ui.screen.copy()
+        else:
+            for rect in LIVE_REGIONS:
+                self.ui.screen.blit(self.hud_snapshot, rect, rect)
+        
         # Waveform
         if self.is_paused:
             elapsed = self.pause_position
         else:
             elapsed = pygame.time.get_ticks() - self.track_start_time
+        elapsed += int(current_song.leading_silence_ms)
         
         duration_ms = current_song.duration * 1000
         play_pos = min(elapsed / duration_ms, 1.0) if duration_ms > 0 else 0
         
-        self.ui.draw_waveform_pro(current_song.waveform, 20, 180, 1360, 160, 
+        self.ui.draw_waveform_pro(current_song.waveform, *WAVEFORM_RECT, 
                                  play_pos, self.ui.deck_a_color)
         
         # Time display
         elapsed_sec = elapsed // 1000
         total_sec = int(current_song.duration)
-        self.ui.draw_time_display(elapsed_sec, total_sec, 610, 360)
+        self.ui.draw_time_display(elapsed_sec, total_sec, *TIME_DISPLAY_RECT.topleft)
         
         # Crossfade progress
-        if self.fade_start > 0:
-            fade_elapsed = pygame.time.get_ticks() - self.fade_start
+        if fade_start > 0:
+            fade_elapsed = pygame.time.get_ticks() - fade_start
             fade_progress = min(fade_elapsed / FADE_DURATION, 1.0)
             
-            bar_x, bar_y, bar_w, bar_h = 20, 450, 1360, 20
+            bar_x, bar_y, bar_w, bar_h = XFADE_BAR_RECT
             pygame.draw.rect(self.ui.screen, self.ui.bg_panel, (bar_x, bar_y, bar_w, bar_h))
             
             fill_w = int(fade_progress * bar_w)
             # Gradient crossfade bar
-            for i in range(fill_w):
-                blend = i / bar_w
-                color = tuple(int(self.ui.deck_a_color[j] * (1-blend) + self.ui.deck_b_color[j] * blend) 
-                            for j in range(3))
-                pygame.draw.line(self.ui.screen, color, (bar_x + i, bar_y), (bar_x + i, bar_y + bar_h))
+            gradient = self.ui.gradient_cache.get('xfade')
+            if gradient is None:
+                blend = (np.arange(bar_w) / bar_w)[:, np.newaxis]
+                colors = (np.array(self.ui.deck_a_color) * (1 - blend) +
+                          np.array(self.ui.deck_b_color) * blend).astype(np.int32)
+                gradient = self.ui.gradient_surface(colors, (bar_w, bar_h + 1), vertical=False)
+                self.ui.gradient_cache['xfade'] = gradient
+            if fill_w > 0:
+                self.ui.screen.blit(gradient, (bar_x, bar_y), (0, 0, fill_w, bar_h + 1))
             
             pygame.draw.rect(self.ui.screen, self.ui.line_color, (bar_x, bar_y, bar_w, bar_h), 1)
             
-            fade_text = self.ui.small_font.render(f"CROSSFADE {int(fade_progress * 100)}%", 
-                                                  True, self.ui.text_primary)
+            fade_text = self.ui.render_text(f"CROSSFADE {int(fade_progress * 100)}%", 
+                                            self.ui.small_font, self.ui.text_primary)
             self.ui.screen.blit(fade_text, (bar_x + 10, bar_y + 3))
         
         # Volume faders
         new_vol_a = self.ui.draw_fader_professional(
-            120, 500, 50, 250, self.volumes[0], "DECK A", self.ui.deck_a_color
+            *FADER_A_RECT, self.volumes[0], "DECK A", self.ui.deck_a_color
         )
         if new_vol_a is not None:
             self.volumes[0] = new_vol_a
             self.channels[0].set_volume(self.volumes[0])
         
         new_vol_b = self.ui.draw_fader_professional(
-            1230, 500, 50, 250, self.volumes[1], "DECK B", self.ui.deck_b_color
+            *FADER_B_RECT, self.volumes[1], "DECK B", self.ui.deck_b_color
         )
         if new_vol_b is not None:
             self.volumes[1] = new_vol_b
             self.channels[1].set_volume(self.volumes[1])
         
         # Control buttons
-        button_y = 790
-        button_h = 50
-        
         pause_label = "PAUSE" if not self.is_paused else "PLAY"
-        if self.ui.draw_button_pro(pause_label, 300, button_y, 150, button_h, 
-                                   self.ui.bg_highlight):
+        if self.ui.draw_button_pro(pause_label, *PAUSE_BUTTON_RECT, self.ui.bg_highlight):
             if not self.is_paused:
                 self.pause_position = pygame.time.get_ticks() - self.track_start_time
                 self.channels[self.current_channel].pause()
@@ -863,48 +1369,54 @@ class DJMixerApp:
                 self.track_start_time = pygame.time.get_ticks() - self.pause_position
                 self.channels[self.current_channel].unpause()
                 self.is_paused = False
-            time.sleep(0.1)
         
-        if self.ui.draw_button_pro("NEXT", 480, button_y, 150, button_h, self.ui.bg_highlight):
-            if self.fade_start == 0:
-                self.trigger_crossfade()
-            time.sleep(0.1)
+        if self.ui.draw_button_pro("NEXT", *NEXT_BUTTON_RECT, self.ui.bg_highlight):
+            self.request_crossfade()
         
         # Sort modes
-        sort_colors = {"bpm_key": (80, 150, 80), "bpm": (80, 120, 180), "energy": (180, 120, 80)}
-        sort_labels = {"bpm_key": "BPM+KEY", "bpm": "BPM", "energy": "ENERGY"}
-        
-        if self.ui.draw_button_pro(f"SORT: {sort_labels[self.sort_mode]}", 
-                                   770, button_y, 180, button_h, sort_colors[self.sort_mode]):
-            modes = ["bpm_key", "bpm", "energy"]
-            current_idx = modes.index(self.sort_mode)
-            self.sort_mode = modes[(current_idx + 1) % len(modes)]
+        if self.ui.draw_button_pro(f"SORT: {SORT_LABELS[self.sort_mode]}", 
+                                   *SORT_BUTTON_RECT, SORT_COLORS[self.sort_mode]):
+            current_idx = SORT_MODES.index(self.sort_mode)
+            self.sort_mode = SORT_MODES[(current_idx + 1) % len(SORT_MODES)]
             self.apply_sort()
-            time.sleep(0.1)
-        
-        # Status info
-        status_y = 855
-        status_items = [
-            (f"BPM: {current_song.bpm:.0f}", 30),
-            (f"KEY: {current_song.key} ({current_song.camelot})", 180),
-            (f"ENERGY: {current_song.energy:.2f}", 420),
-            (f"SORT: {sort_labels[self.sort_mode]}", 620)
-        ]
-        
-        for text, x_pos in status_items:
-            status_text = self.ui.tiny_font.render(text, True, self.ui.text_dim)
-            self.ui.screen.blit(status_text, (x_pos, status_y))
-        
-        pygame.display.flip()
+            # The re-sort usually changes the upcoming track; replace the stale
+            # preload now (a running fade preloads again when it finishes)
+            if fade_start == 0:
+                self.preload_next_track()
+        
+        # A click that changed the sort order or pause state invalidates the
+        # backdrop; rebuild it before presenting
+        if (self.sort_mode, self.is_paused) != hud_key[2:]:
+            self.ui.clicks.clear()
+            self.draw_playing_screen()
+        elif rebuild:
+            pygame.display.flip()
+        else:
+            pygame.display.update(LIVE_REGIONS)
     
     def run(self):
         running = True
         
         while running:
+            self.ui.clicks.clear()
             for event in pygame.event.get():
                 if event.type == QUIT:
                     running = False
                 
+                elif event.type == VIDEOEXPOSE:
+                    self.ui.drag_screen_shown = False
+                    self.hud_key = None
+                
+                elif event.type == MOUSEBUTTONDOWN and event.button == 1:
+                    self.ui.clicks.append(event.pos)
+                
+                elif event.type in TRACK_END_EVENTS and self.state == "playing":
+                    # Stopping the outgoing deck also posts its event; only the
+                    # live deck running out outside a fade advances the playlist
+                    if (event.type == TRACK_END_EVENTS[self.current_channel] and 
+                        self.fade_start == 0):
+                        self.trigger_crossfade()
+                
                 elif event.type == DROPFILE and self.state == "waiting":
                     dropped_path = event.file
                     if os.path.isdir(dropped_path):
@@ -916,27 +1428,39 @@ class DJMixerApp:
                 
                 elif event.type == KEYDOWN:
                     if event.key == K_SPACE and self.state == "playing":
-                        if self.fade_start == 0:
-                            self.trigger_crossfade()
+                        self.request_crossfade()
                     elif event.key == K_ESCAPE:
                         running = False
             
-            if (self.state == "playing" and self.fade_start == 0 and 
-                not self.channels[self.current_channel].get_busy()):
-                self.trigger_crossfade()
+            # One mouse poll per frame, shared by the buttons, faders and frame pacing
+            self.ui.mouse_pos = pygame.mouse.get_pos()
+            self.ui.mouse_down = pygame.mouse.get_pressed()[0]
             
-            if self.state == "playing":
-                self.update_crossfade()
+            if (self.state == "playing" and self.pending_fade_at > 0 and
+                pygame.time.get_ticks() >= self.pending_fade_at):
+                self.trigger_crossfade()
             
             if self.state == "waiting":
                 self.ui.draw_drag_screen()
+            elif self.state == "loading":
+                self.show_loading_progress()
             elif self.state == "playing":
                 self.draw_playing_screen()
             
-            self.ui.clock.tick(60)
+            busy = (self.fade_start > 0 or self.pending_fade_at > 0 or
+                    self.ui.mouse_down)
+            self.ui.clock.tick(ACTIVE_FPS if busy else IDLE_FPS)
         
+        # Stop any running crossfade ramp before the mixer goes away
+        with self.fade_lock:
+            self.fade_start = 0
         pygame.quit()
 
 if __name__ == "__main__":
-    app = DJMixerApp()
+    parser = argparse.ArgumentParser(description="HDJ PRO - Professional DJ Software")
+    parser.add_argument("--fade-curve", choices=list(FADE_CURVES), default=DEFAULT_FADE_CURVE,
+                        help="crossfade gain curve (default: %(default)s)")
+    args = parser.parse_args()
+    
+    app = DJMixerApp(fade_curve=args.fade_curve)
     app.run()